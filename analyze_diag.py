@@ -1,15 +1,31 @@
 #/usr/bin/env python3
 
-import json
 import sys
 import os
+import io
 import re
+import array
+import hashlib
+import mmap
+import heapq
+import operator
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
 import rich.console
+import rich.markup
+import rich.style
 import rich.table
 
 import plotille
 
+try:
+    import orjson as json
+    HAS_ORJSON = True
+except ImportError:
+    import json
+    HAS_ORJSON = False
+
 
 class Result():
     CODE_CLUSTER_HEALTH = "CLUSTER_HEALTH"
@@ -25,6 +41,8 @@ class Result():
     CODE_DURATION = "DURATION"
     CODE_GC = "GC"
 
+    __slots__ = ("message", "code", "value", "bad")
+
     def __init__(self, message, code, bad=False, value=None) -> None:
         self.message = message
         self.code = code
@@ -67,31 +85,288 @@ class Analyzer():
     root_path = None
     console = None
 
-    results = []
-    charts = []
-    
+    STYLE_BAD_HEADER = rich.style.Style.parse("bold red")
+    STYLE_BAD = rich.style.Style.parse("bold red")
+    STYLE_CHARTS_HEADER = rich.style.Style.parse("bold yellow")
+    STYLE_CHARTS = rich.style.Style.parse("yellow")
+    STYLE_GOOD_HEADER = rich.style.Style.parse("bold green")
+    STYLE_GOOD = rich.style.Style.parse("green")
+
+    JSON_FILES = (
+        "cluster_health.json",
+        "nodes.json",
+        "nodes_stats.json",
+        "indices_stats.json",
+        "shards.json",
+        "settings.json",
+        "fielddata_stats.json",
+        "mapping.json",
+        "pending_tasks.json",
+    )
+    INPUT_FILES = JSON_FILES + ("cluster_state.json", "nodes_hot_threads.txt")
+    RESULTS_CACHE_FILE = ".analyze_cache.json"
+
+    HOT_THREADS_BLOCK_SEP_RE = re.compile(rb"\n\s*\n")
+    HOT_THREAD_RE = re.compile(rb"^[ \t]*9\d\.\d%", re.MULTILINE)
+
+    MB = 1024 * 1024
     GB = 1024 * 1024 * 1024
 
+    MS_PER_HOUR = 1000 * 3600
+
+    MMAP_MIN_SIZE = 8 * MB
+
     def __init__(self, root_path: str):
         self.root_path = root_path
         self.console = rich.console.Console()
+        self.results = []
+        self.charts = []
+        self.good = []
+        self.bad = []
+        self._json_cache = {}
+        self._json_futures = {}
+        self._nodes_stats_scan = None
+        self._mappings_scan = None
+        self._sizes = {}
+        self._mtimes = {}
+        for e in os.scandir(root_path):
+            if e.is_file():
+                st = e.stat()
+                self._sizes[e.name] = st.st_size
+                self._mtimes[e.name] = st.st_mtime_ns
+
+    def _add_result(self, result: Result):
+        self.results.append(result)
+        if result.is_bad():
+            self.bad.append(result)
+        else:
+            self.good.append(result)
+
+    def _load_json(self, fname: str) -> any:
+        if fname in self._json_cache:
+            return self._json_cache[fname]
+
+        future = self._json_futures.pop(fname, None)
+        data = future.result() if future is not None else self._read_json(fname)
+        self._json_cache[fname] = data
+        return data
+
+    def _read_json(self, fname: str) -> any:
+        with open(os.path.join(self.root_path, fname), "rb") as f:
+            if HAS_ORJSON and self._sizes.get(fname, 0) >= self.MMAP_MIN_SIZE:
+                # orjson parses large files straight from the mapped pages, no bytes copy of the whole file
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as buf:
+                    data = json.loads(buf)
+            else:
+                data = json.loads(f.read())
+
+        return data
+
+    def _drop_json(self, fname: str):
+        self._json_cache.pop(fname, None)
+
+    def _prefetch_json(self, executor: ThreadPoolExecutor):
+        # parse dump files in the background; _load_json only blocks on ones not finished yet
+        for fname in self.JSON_FILES:
+            if fname in self._sizes and fname not in self._json_cache:
+                self._json_futures[fname] = executor.submit(self._read_json, fname)
+
+    def _signature(self) -> str:
+        # covers this script too, so edited thresholds invalidate cached results
+        h = hashlib.blake2b(digest_size=16)
+        h.update(str(os.stat(__file__).st_mtime_ns).encode())
+        for fname in self.INPUT_FILES:
+            if fname in self._mtimes:
+                h.update(f"{fname}:{self._sizes[fname]}:{self._mtimes[fname]}\n".encode())
+        return h.hexdigest()
+
+    def _load_cached_results(self) -> bool:
+        if self.RESULTS_CACHE_FILE not in self._sizes:
+            return False
+
+        try:
+            cached = self._load_json(self.RESULTS_CACHE_FILE)
+        except ValueError:
+            return False
+        finally:
+            self._drop_json(self.RESULTS_CACHE_FILE)
+
+        if cached.get("signature") != self._signature():
+            return False
+
+        for r in cached["results"]:
+            result = Result.from_dict(r)
+            self._add_result(result)
+            # the replayed message points at hot_threads.txt, which may not exist in this working directory
+            if result.get_code() == Result.CODE_HOT_THREADS and result.is_bad():
+                self._write_hot_threads(result.get_value())
+        self.charts.extend(cached["charts"])
+        return True
+
+    def _save_cached_results(self):
+        charts = []
+        for chart in self.charts:
+            if not isinstance(chart, str):
+                # tables are cached as their plain-text rendering
+                plain = rich.console.Console(file=io.StringIO(), width=self.console.width, color_system=None)
+                plain.print(chart)
+                chart = plain.file.getvalue().rstrip("\n")
+            charts.append(chart)
+
+        data = json.dumps({
+            "signature": self._signature(),
+            "results": [r.to_dict() for r in self.results],
+            "charts": charts,
+        })
+        if isinstance(data, str):
+            data = data.encode()
+
+        try:
+            with open(os.path.join(self.root_path, self.RESULTS_CACHE_FILE), "wb") as f:
+                f.write(data)
+        except OSError:
+            pass  # read-only dump directory; the cache is only an optimisation
+
+    def _scan_nodes_stats(self) -> dict:
+        # one pass over nodes_stats.json collects the offenders for every per-node check
+        if self._nodes_stats_scan is not None:
+            return self._nodes_stats_scan
+
+        high_heap_nodes = []
+        high_cpu_nodes = []
+        high_memory_nodes = []
+        low_disk_nodes = []
+        high_disk_io_nodes = []
+        high_disk_nodes = []
+        GB = self.GB
+
+        for n in self._load_json("nodes_stats.json")["nodes"].values():
+            name = n["name"]
+            os_stats = n["os"]
+            fs_stats = n["fs"]
+            fs_total = fs_stats["total"]
+
+            heap_usage = n["jvm"]["mem"]["heap_used_percent"]
+            if heap_usage > 75:
+                high_heap_nodes.append((name, heap_usage))
+
+            cpu_usage = os_stats["cpu"]["percent"]
+            if cpu_usage > 80:
+                high_cpu_nodes.append((name, cpu_usage))
+
+            memory_usage = os_stats["mem"]["used_percent"]
+            if memory_usage > 80:
+                high_memory_nodes.append((name, memory_usage))
+
+            disk_available = fs_total["available_in_bytes"] / GB
+            if disk_available < 10:  # less than 10 GB free
+                low_disk_nodes.append((name, disk_available))
+
+            disk_io = fs_stats["io_stats"]["total"]["operations"]
+            if disk_io > 1000000:  # arbitrary threshold for high disk I/O
+                high_disk_io_nodes.append((name, disk_io))
+
+            disk_free = fs_total["free_in_bytes"] / fs_total["total_in_bytes"] * 100
+            if disk_free < 15:
+                high_disk_nodes.append((name, disk_free))
+
+        self._nodes_stats_scan = {
+            "HIGH_JVM_HEAP_USAGE": high_heap_nodes,
+            "HIGH_CPU_USAGE": high_cpu_nodes,
+            "HIGH_MEMORY_USAGE": high_memory_nodes,
+            "LOW_DISK_SPACE": low_disk_nodes,
+            "HIGH_DISK_IO": high_disk_io_nodes,
+            "DISK_WATERMARK_EXCEEDED": high_disk_nodes,
+        }
+        return self._nodes_stats_scan
+
+    def _scan_mappings(self) -> dict:
+        # one pass over mapping.json collects the offenders for every mapping check
+        if self._mappings_scan is not None:
+            return self._mappings_scan
+
+        problematic_indices = []
+        dynamic_mapping_enabled = []
+        custom_fields_indices = []
+        problematic_fields = []
+        high_field_count_indices = []
+        high_nested_field_indices = []
+
+        for index, mapping in self._load_json("mapping.json").items():
+            mappings = mapping["mappings"]
+            fields_data = mappings.get("properties", mappings)
+
+            if mappings.get("dynamic", "true") == "true":
+                dynamic_mapping_enabled.append(index)
+
+            field_count = len(fields_data)
+            if field_count > 200:  # arbitrary threshold for high field count
+                high_field_count_indices.append((index, field_count))
+
+            has_custom_fields = False
+            nested_field_count = 0
+            for field, field_data in fields_data.items():
+                field_type = field_data.get("type")
+
+                if field == "_id" and field_type != "keyword":
+                    problematic_indices.append(index)
+
+                if field.startswith("custom_"):
+                    has_custom_fields = True
+
+                if field_type == "nested":
+                    nested_field_count += 1
+                elif field_type == "text" and field_data.get("fielddata", False):
+                    problematic_fields.append((index, field))
+
+            if has_custom_fields:
+                custom_fields_indices.append(index)
+
+            if nested_field_count > 5:  # arbitrary threshold for high nested field count
+                high_nested_field_indices.append((index, nested_field_count))
 
-    def _load_json(self, fname: str) -> any: 
-        with open(os.path.join(self.root_path, fname)) as f: 
-            return json.load(f)
+        self._mappings_scan = {
+            "NON_KEYWORD_ID_FIELD": problematic_indices,
+            "DYNAMIC_MAPPING_ENABLED": dynamic_mapping_enabled,
+            "CUSTOM_FIELDS": custom_fields_indices,
+            "PROBLEMATIC_FIELD_DATA_TYPE": problematic_fields,
+            "HIGH_FIELD_COUNT": high_field_count_indices,
+            "HIGH_NESTED_FIELD_COUNT": high_nested_field_indices,
+        }
+        return self._mappings_scan
+
+    def _add_node_stats_results(self, code: str, bad_message: str, good_message: str, format_value=None):
+        # bad_message is formatted with the node name and the offending value,
+        # passed through format_value for display only; the Result keeps the raw value
+        offending_nodes = self._scan_nodes_stats()[code]
+
+        if offending_nodes:
+            for node, value in offending_nodes:
+                self._add_result(Result(
+                    bad_message.format(node=node, value=format_value(value) if format_value else value),
+                    code=code,
+                    bad=True,
+                    value=value,
+                ))
+        else:
+            self._add_result(Result(
+                good_message,
+                code=code,
+                bad=False,
+            ))
 
     def check_cluster_health(self):
         cluster_health = self._load_json("cluster_health.json")
 
         if cluster_health["status"] != "green":
-            self.results.append(Result(
-                "Cluster is: %s" % cluster_health["status"].upper(),
+            self._add_result(Result(
+                f"Cluster is: {cluster_health['status'].upper()}",
                 code=Result.CODE_CLUSTER_HEALTH,
                 bad=True,
                 value=cluster_health["status"],
             ))
         else:
-            self.results.append(Result(
+            self._add_result(Result(
                 "Cluster is: GREEN",
                 code=Result.CODE_CLUSTER_HEALTH,
                 bad=False,
@@ -101,17 +376,17 @@ class Analyzer():
     def check_nodes(self):
         nodes_data = self._load_json("nodes.json")["nodes"]
         node_count = len(nodes_data)
-        compressed_oops_count = sum([n["jvm"]["using_compressed_ordinary_object_pointers"] == "true" for n in nodes_data.values()])
+        compressed_oops_count = sum(1 for n in nodes_data.values() if n["jvm"]["using_compressed_ordinary_object_pointers"] == "true")
 
         if compressed_oops_count < node_count:
-            self.results.append(Result(
-                "Compressed OOPs off for %s nodes out of %s" % (node_count - compressed_oops_count, node_count),
+            self._add_result(Result(
+                f"Compressed OOPs off for {node_count - compressed_oops_count} nodes out of {node_count}",
                 code=Result.CODE_COMPRESSED_OOPS,
                 bad=True,
                 value=node_count - compressed_oops_count,
             ))
         else:
-            self.results.append(Result(
+            self._add_result(Result(
                 "Compressed OOPs on for all nodes",
                 code=Result.CODE_COMPRESSED_OOPS,
                 bad=False,
@@ -123,49 +398,50 @@ class Analyzer():
         total_docs = indices_data["_all"]["primaries"]["docs"]["count"]
         deleted_docs = indices_data["_all"]["primaries"]["docs"]["deleted"]
 
-        values = (total_docs, deleted_docs, deleted_docs / total_docs * 100)
-        self.results.append(Result(
-            "Total docs: %s; deleted docs: %s (%.2f%%)" % values,
+        deleted_docs_pct = deleted_docs / total_docs * 100 if total_docs else 0.0
+        values = (total_docs, deleted_docs, deleted_docs_pct)
+        self._add_result(Result(
+            f"Total docs: {total_docs}; deleted docs: {deleted_docs} ({deleted_docs_pct:.2f}%)",
             code=Result.CODE_DOCS_COUNT,
             bad=False,
             value=values,
         ))
 
         refresh_duration_millis = indices_data["_all"]["primaries"]["refresh"]["total_time_in_millis"]
-        refresh_duration_hours = refresh_duration_millis / 1000 / 3600
+        refresh_duration_hours = refresh_duration_millis / self.MS_PER_HOUR
 
-        self.results.append(Result(
-            "Refresh duration: total %.2f hours" % refresh_duration_hours,
+        self._add_result(Result(
+            f"Refresh duration: total {refresh_duration_hours:.2f} hours",
             code=Result.CODE_DURATION,
             bad=False,
             value=refresh_duration_hours,
         ))
 
         flush_duration_millis = indices_data["_all"]["primaries"]["flush"]["total_time_in_millis"]
-        flush_duration_hours = flush_duration_millis / 1000 / 3600
+        flush_duration_hours = flush_duration_millis / self.MS_PER_HOUR
 
-        self.results.append(Result(
-            "Flush duration: total %.2f hours" % flush_duration_hours,
+        self._add_result(Result(
+            f"Flush duration: total {flush_duration_hours:.2f} hours",
             code=Result.CODE_DURATION,
             bad=False,
             value=flush_duration_hours,
         ))
 
         index_duration_millis = indices_data["_all"]["primaries"]["indexing"]["index_time_in_millis"]
-        index_duration_hours = index_duration_millis / 1000 / 3600
+        index_duration_hours = index_duration_millis / self.MS_PER_HOUR
 
-        self.results.append(Result(
-            "Indexing duration: total %.2f hours" % index_duration_hours,
+        self._add_result(Result(
+            f"Indexing duration: total {index_duration_hours:.2f} hours",
             code=Result.CODE_DURATION,
             bad=False,
             value=index_duration_hours,
         ))
 
         search_duration_millis = indices_data["_all"]["primaries"]["search"]["query_time_in_millis"]
-        search_duration_hours = search_duration_millis / 1000 / 3600
+        search_duration_hours = search_duration_millis / self.MS_PER_HOUR
 
-        self.results.append(Result(
-            "Search duration: total %.2f hours" % search_duration_hours,
+        self._add_result(Result(
+            f"Search duration: total {search_duration_hours:.2f} hours",
             code=Result.CODE_DURATION,
             bad=False,
             value=search_duration_hours,
@@ -175,105 +451,135 @@ class Analyzer():
         shards_data = self._load_json("shards.json")
         shards_count = len(shards_data)
 
+        # unboxed doubles instead of one Python float object per shard
+        shard_docs_millions = array.array("d")
+        shard_sizes_gb = array.array("d")
+        small_shards_count = 0
+        large_shards_count = 0
+        shards_by_node = Counter()
+        # MB and GB are powers of two, so multiplying by the reciprocal is exact
+        per_mb, per_gb = 1.0 / self.MB, 1.0 / self.GB
+        small_shard_bytes = self.GB
+        large_shard_bytes = 50 * self.GB
+        docs_append = shard_docs_millions.append
+        sizes_append = shard_sizes_gb.append
+
+        for s in shards_data:
+            get = s.get
+            # _cat/shards reports numbers as strings; skip int() when a dump already holds numbers
+            docs = get("docs")
+            if docs:
+                if type(docs) is not int:
+                    docs = int(docs)
+                docs_append(docs * per_mb)
+
+            store = get("store")
+            if store:
+                if type(store) is not int:
+                    store = int(store)
+                sizes_append(store * per_gb)
+                small_shards_count += store < small_shard_bytes
+                large_shards_count += store > large_shard_bytes
+
+            shards_by_node[s["node"]] += 1
+
+        # shards.json is the largest input and only this check reads it
+        self._drop_json("shards.json")
+
         if shards_count > 20000:
-            self.results.append(Result(
-                "Cluster has %s shards, that can cause some instability" % shards_count,
+            self._add_result(Result(
+                f"Cluster has {shards_count} shards, that can cause some instability",
                 code=Result.CODE_OVERSHARDING,
                 bad=True,
                 value=shards_count,
             ))
         else:
-            self.results.append(Result(
-                "Cluster has %s shards, that should not cause any issues" % shards_count,
+            self._add_result(Result(
+                f"Cluster has {shards_count} shards, that should not cause any issues",
                 code=Result.CODE_OVERSHARDING,
                 bad=True,
                 value=shards_count,
             ))
 
         self.charts.append("Shards by doc count (millions)")
-        self.charts.append(plotille.histogram([int(s["docs"]) / 1024 / 1024 for s in shards_data if s.get("docs")], height=10, x_min=0, x_max=100))
+        self.charts.append(plotille.histogram(shard_docs_millions, height=10, x_min=0, x_max=100))
 
         self.charts.append("Shards by disk size (GB)")
-        shard_sizes_gb = [int(s["store"]) / self.GB for s in shards_data if s.get("store")]
         self.charts.append(plotille.histogram(shard_sizes_gb, height=10, x_min=0, x_max=100))
 
-        small_shards_count = len([s for s in shard_sizes_gb if s < 1])
-        large_shards_count = len([s for s in shard_sizes_gb if s > 50])
+        small_shards_pct = small_shards_count / shards_count * 100
+        large_shards_pct = large_shards_count / shards_count * 100
 
         if small_shards_count > 0.1 * shards_count:
-            self.results.append(Result(
-                "Cluster has %s (%.2f%%) small (less than 1 GB) shards, shrinking or merging recommended" % (small_shards_count, small_shards_count / shards_count * 100),
+            self._add_result(Result(
+                f"Cluster has {small_shards_count} ({small_shards_pct:.2f}%) small (less than 1 GB) shards, shrinking or merging recommended",
                 code=Result.CODE_MANY_SMALL_SHARDS,
                 bad=True,
                 value=small_shards_count,
             ))
         else:
-            self.results.append(Result(
-                "Cluster has %s (%.2f%%) small (less than 1 GB) shards" % (small_shards_count, small_shards_count / shards_count * 100),
+            self._add_result(Result(
+                f"Cluster has {small_shards_count} ({small_shards_pct:.2f}%) small (less than 1 GB) shards",
                 code=Result.CODE_MANY_SMALL_SHARDS,
                 bad=False,
                 value=small_shards_count,
             ))
 
         if large_shards_count > 0:
-            self.results.append(Result(
-                "Cluster has %s (%.2f%%) large (more than 50 GB) shards" % (large_shards_count, large_shards_count / shards_count * 100),
+            self._add_result(Result(
+                f"Cluster has {large_shards_count} ({large_shards_pct:.2f}%) large (more than 50 GB) shards",
                 code=Result.CODE_MANY_LARGE_SHARDS,
                 bad=True,
                 value=large_shards_count,
             ))
         else:
-            self.results.append(Result(
-                "Cluster has %s (%.2f%%) large (more than 50 GB) shards" % (large_shards_count, large_shards_count / shards_count * 100),
+            self._add_result(Result(
+                f"Cluster has {large_shards_count} ({large_shards_pct:.2f}%) large (more than 50 GB) shards",
                 code=Result.CODE_MANY_LARGE_SHARDS,
                 bad=False,
                 value=large_shards_count,
             ))
 
-        cluster_state_size = os.path.getsize(os.path.join(self.root_path, "cluster_state.json"))
-        cluster_state_size_mb = cluster_state_size / 1024 / 1024
+        cluster_state_size = self._sizes["cluster_state.json"]
+        cluster_state_size_mb = cluster_state_size / self.MB
 
         if cluster_state_size_mb > 50:
-            self.results.append(Result(
-                "Cluster state size is %.2f MB; this might cause various issues across the cluster" % cluster_state_size_mb,
+            self._add_result(Result(
+                f"Cluster state size is {cluster_state_size_mb:.2f} MB; this might cause various issues across the cluster",
                 code=Result.CODE_CLUSTER_STATE_SIZE,
                 bad=True,
                 value=cluster_state_size_mb,
             ))
         else:
-            self.results.append(Result(
-                "Cluster state size is %.2f MB" % cluster_state_size_mb,
+            self._add_result(Result(
+                f"Cluster state size is {cluster_state_size_mb:.2f} MB",
                 code=Result.CODE_CLUSTER_STATE_SIZE,
                 bad=False,
                 value=cluster_state_size_mb,
             ))
 
-        shards_by_node = {}
-
-        for s in shards_data:
-            if s["node"] not in shards_by_node:
-                shards_by_node[s["node"]] = 0
-            
-            shards_by_node[s["node"]] += 1
-
         self.charts.append("Nodes by shard count")
         self.charts.append(plotille.histogram(shards_by_node.values(), height=10, x_min=0))
 
     def check_settings(self):
         settings_data = self._load_json("settings.json").values()
         indices_count = len(settings_data)
-        refresh_1s_indices_count = len([i for i in settings_data if i["settings"]["index"].get("refresh_interval", "1s")])
+        if not indices_count:
+            return
 
-        if refresh_1s_indices_count / indices_count > 0.1:
-            self.results.append(Result(
-                "refresh_interval is default 1s for %s indices (%.2f%%), consider raising to 30s or 60s to speed up ingestion" % (refresh_1s_indices_count, refresh_1s_indices_count / indices_count * 100),
+        refresh_1s_indices_count = sum(1 for i in settings_data if i["settings"]["index"].get("refresh_interval", "1s") == "1s")
+        refresh_1s_indices_pct = refresh_1s_indices_count / indices_count * 100
+
+        if refresh_1s_indices_count > 0.1 * indices_count:
+            self._add_result(Result(
+                f"refresh_interval is default 1s for {refresh_1s_indices_count} indices ({refresh_1s_indices_pct:.2f}%), consider raising to 30s or 60s to speed up ingestion",
                 code=Result.CODE_REFRESH_INTERVAL,
                 bad=False,
                 value=refresh_1s_indices_count,
             ))
         else:
-            self.results.append(Result(
-                "refresh_interval is default 1s for %s indices (%.2f%%), that's ok" % (refresh_1s_indices_count, refresh_1s_indices_count / indices_count * 100),
+            self._add_result(Result(
+                f"refresh_interval is default 1s for {refresh_1s_indices_count} indices ({refresh_1s_indices_pct:.2f}%), that's ok",
                 code=Result.CODE_REFRESH_INTERVAL,
                 bad=False,
                 value=refresh_1s_indices_count,
@@ -282,113 +588,85 @@ class Analyzer():
     def check_fielddata(self):
         fielddata_stats = self._load_json("fielddata_stats.json")
 
-        field_sizes = {}
+        field_sizes = Counter()
 
         for n in fielddata_stats["nodes"].values():
             for f, fdata in n["indices"]["fielddata"].get("fields", {}).items():
-                if f not in field_sizes:
-                    field_sizes[f] = 0
                 field_sizes[f] += fdata["memory_size_in_bytes"]
 
-        field_sizes_list = list(field_sizes.items())
-        field_sizes_list.sort(key=lambda fs: fs[1])
-        field_sizes_list.reverse()
+        top_fields = heapq.nlargest(10, field_sizes.items(), key=operator.itemgetter(1))
 
         self.charts.append("Fields cardinality")
         table = rich.table.Table(title="Top 10 largest fields")
         table.add_column("Field", justify="right", style="cyan", no_wrap=True)
         table.add_column("Size (GB)", style="magenta")
-        for f, fs in field_sizes_list[:10]:
-            table.add_row(f, "%.2f" % (fs / self.GB))
+        for f, fs in top_fields:
+            table.add_row(f, f"{fs / self.GB:.2f}")
 
         self.charts.append(table)
 
-        self.charts.append("Zero-data fields (consider removal from mappings)")
-        self.charts.append(" * " + f)
+        zero_fields = [f for f, fs in field_sizes.items() if fs == 0]
+        if zero_fields:
+            self.charts.append("Zero-data fields (consider removal from mappings)")
+            self.charts.append("\n".join(" * " + f for f in zero_fields))
 
     def check_id_field_type(self):
-        mappings_data = self._load_json("mapping.json")
-        problematic_indices = []
-
-        for index, mapping in mappings_data.items():
-            if "properties" in mapping["mappings"]:
-                fields_data = mapping["mappings"]["properties"]
-            else:
-                fields_data = mapping["mappings"]
-            for field, field_data in fields_data.items():
-                if field == "_id" and field_data.get("type") != "keyword":
-                    problematic_indices.append(index)
+        mappings_scan = self._scan_mappings()
+        problematic_indices = mappings_scan["NON_KEYWORD_ID_FIELD"]
 
         if problematic_indices:
             for index in problematic_indices:
-                self.results.append(Result(
-                    "Field _id in index %s is not of type keyword" % index,
+                self._add_result(Result(
+                    f"Field _id in index {index} is not of type keyword",
                     code="NON_KEYWORD_ID_FIELD",
                     bad=True,
                     value=index,
                 ))
         else:
-            self.results.append(Result(
+            self._add_result(Result(
                 "All _id fields are of type keyword",
                 code="NON_KEYWORD_ID_FIELD",
                 bad=False,
             ))
 
-        dynamic_mapping_enabled = []
-        for index, mapping in mappings_data.items():
-            if mapping["mappings"].get("dynamic", "true") == "true":
-                dynamic_mapping_enabled.append(index)
-
+        dynamic_mapping_enabled = mappings_scan["DYNAMIC_MAPPING_ENABLED"]
         if dynamic_mapping_enabled:
             if len(dynamic_mapping_enabled) < 10:
-                self.results.append(Result(
-                    "Dynamic mapping is enabled for indices: %s" % ", ".join(dynamic_mapping_enabled),
+                self._add_result(Result(
+                    f"Dynamic mapping is enabled for indices: {', '.join(dynamic_mapping_enabled)}",
                     code="DYNAMIC_MAPPING_ENABLED",
                     bad=True,
                     value=dynamic_mapping_enabled,
                 ))
             else:
-                self.results.append(Result(
-                    "Dynamic mapping is enabled for %s indices" % len(dynamic_mapping_enabled),
+                self._add_result(Result(
+                    f"Dynamic mapping is enabled for {len(dynamic_mapping_enabled)} indices",
                     code="DYNAMIC_MAPPING_ENABLED",
                     bad=True,
                     value=dynamic_mapping_enabled,
                 ))
         else:
-            self.results.append(Result(
+            self._add_result(Result(
                 "Dynamic mapping is disabled for all indices",
                 code="DYNAMIC_MAPPING_ENABLED",
                 bad=False,
             ))
 
     def check_custom_fields(self):
-        mappings_data = self._load_json("mapping.json")
-        custom_fields_indices = []
-        problematic_fields = []
-
-        for index, mapping in mappings_data.items():
-            if 'properties' in mapping["mappings"]:
-                fields_data = mapping["mappings"]["properties"]
-            else:
-                fields_data = mapping["mappings"]
-            for field, field_data in fields_data.items():
-                if field.startswith("custom_"):
-                    custom_fields_indices.append(index)
-                    break
-
-                if field_data.get("type") == "text" and field_data.get("fielddata", False):
-                    problematic_fields.append((index, field))
+        mappings_scan = self._scan_mappings()
+        custom_fields_indices = mappings_scan["CUSTOM_FIELDS"]
+        problematic_fields = mappings_scan["PROBLEMATIC_FIELD_DATA_TYPE"]
 
         if custom_fields_indices:
             for index in custom_fields_indices:
-                self.results.append(Result(
-                    "Custom fields found in index %s" % index,
+                self._add_result(Result(
+                    f"Custom fields found in index {index}",
                     code="CUSTOM_FIELDS",
                     bad=False,
                     value=index,
                 ))
         else:
-            self.results.append(Result(
+            self._add_result(Result(
                 "No custom fields found in any index",
                 code="CUSTOM_FIELDS",
                 bad=False,
@@ -396,318 +674,167 @@ class Analyzer():
 
         if problematic_fields:
             for index, field in problematic_fields:
-                self.results.append(Result(
-                    "Field %s in index %s has fielddata enabled, which can cause performance issues" % (field, index),
+                self._add_result(Result(
+                    f"Field {field} in index {index} has fielddata enabled, which can cause performance issues",
                     code="PROBLEMATIC_FIELD_DATA_TYPE",
                     bad=True,
                     value=(index, field),
                 ))
         else:
-            self.results.append(Result(
+            self._add_result(Result(
                 "No problematic field data types found",
                 code="PROBLEMATIC_FIELD_DATA_TYPE",
                 bad=False,
             ))
 
     def check_field_count(self):
-        mappings_data = self._load_json("mapping.json")
-        high_field_count_indices = []
-
-        for index, mapping in mappings_data.items():
-            if 'properties' in mapping["mappings"]:
-                field_count = len(mapping["mappings"]["properties"])
-            else:
-                field_count = len(mapping["mappings"])
-            if field_count > 200:  # arbitrary threshold for high field count
-                high_field_count_indices.append((index, field_count))
+        high_field_count_indices = self._scan_mappings()["HIGH_FIELD_COUNT"]
 
         if high_field_count_indices:
             for index, count in high_field_count_indices:
-                self.results.append(Result(
-                    "High field count in index %s: %d fields" % (index, count),
+                self._add_result(Result(
+                    f"High field count in index {index}: {count} fields",
                     code="HIGH_FIELD_COUNT",
                     bad=True,
                     value=count,
                 ))
         else:
-            self.results.append(Result(
+            self._add_result(Result(
                 "Field count is within acceptable limits for all indices",
                 code="HIGH_FIELD_COUNT",
                 bad=False,
             ))
 
     def check_nested_fields(self):
-        mappings_data = self._load_json("mapping.json")
-        high_nested_field_indices = []
-
-        for index, mapping in mappings_data.items():
-            if 'properties' in mapping["mappings"]:
-                fields_data = mapping["mappings"]["properties"]
-            else:
-                fields_data = mapping["mappings"]
-
-            nested_field_count = sum(1 for field in fields_data.values() if field.get("type") == "nested")
-            if nested_field_count > 5:  # arbitrary threshold for high nested field count
-                high_nested_field_indices.append((index, nested_field_count))
+        high_nested_field_indices = self._scan_mappings()["HIGH_NESTED_FIELD_COUNT"]
 
         if high_nested_field_indices:
             for index, count in high_nested_field_indices:
-                self.results.append(Result(
-                    "High nested field count in index %s: %d nested fields" % (index, count),
+                self._add_result(Result(
+                    f"High nested field count in index {index}: {count} nested fields",
                     code="HIGH_NESTED_FIELD_COUNT",
                     bad=True,
                     value=count,
                 ))
         else:
-            self.results.append(Result(
+            self._add_result(Result(
                 "Nested field count is within acceptable limits for all indices",
                 code="HIGH_NESTED_FIELD_COUNT",
                 bad=False,
             ))
 
+    def _write_hot_threads(self, hot_threads: list):
+        with open("hot_threads.txt", "w") as f:
+            f.write("".join("\n".join(t) + "\n\n" for t in hot_threads))
+
     def check_hot_threads(self):
-        with open(os.path.join(self.root_path, "nodes_hot_threads.txt")) as f:
-            hot_threads_raw = f.readlines()
-        
+        with open(os.path.join(self.root_path, "nodes_hot_threads.txt"), "rb") as f:
+            hot_threads_raw = f.read()
+
         hot_threads = []
-        bad_re = re.compile(r"^\s*9\d.\d\%")
-        bad_lines = []
-        bad_block = False
-        for l in hot_threads_raw:
-            if not l.strip() and any(bad_lines):
-                # end of block
-                hot_threads.append(bad_lines[:10])
-                continue
-
-            if bad_re.match(l):
-                bad_lines = [l.strip()]
-                bad_block = True
-                continue
-
-            if bad_block:
-                bad_lines.append(l.strip())
+        # blocks are separated by blank lines; a hot one runs from its 9x.x% line to the block end
+        for block in self.HOT_THREADS_BLOCK_SEP_RE.split(hot_threads_raw):
+            m = self.HOT_THREAD_RE.search(block)
+            if m:
+                bad_lines = block[m.start():].decode("utf-8", "replace").splitlines()
+                hot_threads.append([l.strip() for l in bad_lines[:10]])
 
         if len(hot_threads) > 5:
-            with open("hot_threads.txt", "w") as f:
-                for t in hot_threads:
-                    f.write("\n".join(t))
-                    f.write("\n\n")
-            self.results.append(Result(
-                "%s hot threads detected; details written to hot_threads.txt" % len(hot_threads),
+            self._write_hot_threads(hot_threads)
+            self._add_result(Result(
+                f"{len(hot_threads)} hot threads detected; details written to hot_threads.txt",
                 code=Result.CODE_HOT_THREADS,
                 bad=True,
                 value=hot_threads,
             ))
         else:
-            self.results.append(Result(
-                "%s hot threads detected" % len(hot_threads),
+            self._add_result(Result(
+                f"{len(hot_threads)} hot threads detected",
                 code=Result.CODE_HOT_THREADS,
                 bad=False,
                 value=hot_threads,
             ))
 
     def check_jvm_heap_usage(self):
-        nodes_stats = self._load_json("nodes_stats.json")["nodes"].values()
-        high_heap_nodes = []
-
-        for n in nodes_stats:
-            heap_usage = n["jvm"]["mem"]["heap_used_percent"]
-            if heap_usage > 75:
-                high_heap_nodes.append((n["name"], heap_usage))
-
-        if high_heap_nodes:
-            for node, heap in high_heap_nodes:
-                self.results.append(Result(
-                    "High JVM heap usage on node %s: %d%%" % (node, heap),
-                    code="HIGH_JVM_HEAP_USAGE",
-                    bad=True,
-                    value=heap,
-                ))
-        else:
-            self.results.append(Result(
-                "JVM heap usage is within acceptable limits on all nodes",
-                code="HIGH_JVM_HEAP_USAGE",
-                bad=False,
-            ))
+        self._add_node_stats_results(
+            "HIGH_JVM_HEAP_USAGE",
+            "High JVM heap usage on node {node}: {value}%",
+            "JVM heap usage is within acceptable limits on all nodes",
+        )
 
     def check_pending_tasks(self):
-        if not os.path.exists(os.path.join(self.root_path, "pending_tasks.json")):
+        if "pending_tasks.json" not in self._sizes:
             return
 
         pending_tasks = self._load_json("pending_tasks.json")["tasks"]
         pending_task_count = len(pending_tasks)
 
         if pending_task_count > 0:
-            self.results.append(Result(
-                "There are %d pending tasks in the cluster" % pending_task_count,
+            self._add_result(Result(
+                f"There are {pending_task_count} pending tasks in the cluster",
                 code="PENDING_TASKS",
                 bad=True,
                 value=pending_task_count,
             ))
         else:
-            self.results.append(Result(
+            self._add_result(Result(
                 "There are no pending tasks in the cluster",
                 code="PENDING_TASKS",
                 bad=False,
             ))
 
     def check_cpu_usage(self):
-        nodes_stats = self._load_json("nodes_stats.json")["nodes"].values()
-        high_cpu_nodes = []
-
-        for n in nodes_stats:
-            cpu_usage = n["os"]["cpu"]["percent"]
-            if cpu_usage > 80:
-                high_cpu_nodes.append((n["name"], cpu_usage))
-
-        if high_cpu_nodes:
-            for node, cpu in high_cpu_nodes:
-                self.results.append(Result(
-                    "High CPU usage on node %s: %d%%" % (node, cpu),
-                    code="HIGH_CPU_USAGE",
-                    bad=True,
-                    value=cpu,
-                ))
-        else:
-            self.results.append(Result(
-                "CPU usage is within acceptable limits on all nodes",
-                code="HIGH_CPU_USAGE",
-                bad=False,
-            ))
+        self._add_node_stats_results(
+            "HIGH_CPU_USAGE",
+            "High CPU usage on node {node}: {value}%",
+            "CPU usage is within acceptable limits on all nodes",
+        )
 
     def check_disk_usage(self):
-        nodes_stats = self._load_json("nodes_stats.json")["nodes"].values()
-        low_disk_nodes = []
-
-        for n in nodes_stats:
-            disk_free = n["fs"]["total"]["available_in_bytes"] / self.GB
-            if disk_free < 10:  # less than 10 GB free
-                low_disk_nodes.append((n["name"], disk_free))
-
-        if low_disk_nodes:
-            for node, disk in low_disk_nodes:
-                self.results.append(Result(
-                    "Low disk space on node %s: %.2f GB free" % (node, disk),
-                    code="LOW_DISK_SPACE",
-                    bad=True,
-                    value=disk,
-                ))
-        else:
-            self.results.append(Result(
-                "Disk space is within acceptable limits on all nodes",
-                code="LOW_DISK_SPACE",
-                bad=False,
-            ))
+        self._add_node_stats_results(
+            "LOW_DISK_SPACE",
+            "Low disk space on node {node}: {value:.2f} GB free",
+            "Disk space is within acceptable limits on all nodes",
+        )
 
     def check_memory_usage(self):
-        nodes_stats = self._load_json("nodes_stats.json")["nodes"].values()
-        high_memory_nodes = []
-
-        for n in nodes_stats:
-            memory_usage = n["os"]["mem"]["used_percent"]
-            if memory_usage > 80:
-                high_memory_nodes.append((n["name"], memory_usage))
-
-        if high_memory_nodes:
-            for node, memory in high_memory_nodes:
-                self.results.append(Result(
-                    "High memory usage on node %s: %d%%" % (node, memory),
-                    code="HIGH_MEMORY_USAGE",
-                    bad=True,
-                    value=memory,
-                ))
-        else:
-            self.results.append(Result(
-                "Memory usage is within acceptable limits on all nodes",
-                code="HIGH_MEMORY_USAGE",
-                bad=False,
-            ))
-
-        high_disk_io_nodes = []
-
-        for n in nodes_stats:
-            disk_io = n["fs"]["io_stats"]["total"]["operations"]
-            if disk_io > 1000000:  # arbitrary threshold for high disk I/O
-                high_disk_io_nodes.append((n["name"], disk_io))
+        self._add_node_stats_results(
+            "HIGH_MEMORY_USAGE",
+            "High memory usage on node {node}: {value}%",
+            "Memory usage is within acceptable limits on all nodes",
+        )
 
-        if high_disk_io_nodes:
-            for node, io in high_disk_io_nodes:
-                self.results.append(Result(
-                    "High disk I/O on node %s: %d operations" % (node, io),
-                    code="HIGH_DISK_IO",
-                    bad=True,
-                    value=io,
-                ))
-        else:
-            self.results.append(Result(
-                "Disk I/O is within acceptable limits on all nodes",
-                code="HIGH_DISK_IO",
-                bad=False,
-            ))
+        self._add_node_stats_results(
+            "HIGH_DISK_IO",
+            "High disk I/O on node {node}: {value} operations",
+            "Disk I/O is within acceptable limits on all nodes",
+        )
 
     def check_unassigned_shards(self):
         cluster_health = self._load_json("cluster_health.json")
         unassigned_shards = cluster_health["unassigned_shards"]
 
         if unassigned_shards > 0:
-            self.results.append(Result(
-                "There are %d unassigned shards in the cluster" % unassigned_shards,
+            self._add_result(Result(
+                f"There are {unassigned_shards} unassigned shards in the cluster",
                 code="UNASSIGNED_SHARDS",
                 bad=True,
                 value=unassigned_shards,
             ))
         else:
-            self.results.append(Result(
+            self._add_result(Result(
                 "There are no unassigned shards in the cluster",
                 code="UNASSIGNED_SHARDS",
                 bad=False,
             ))
 
     def check_disk_watermark(self):
-        nodes_stats = self._load_json("nodes_stats.json")["nodes"].values()
-        high_disk_nodes = []
-
-        for n in nodes_stats:
-            disk_free = n["fs"]["total"]["free_in_bytes"] / n["fs"]["total"]["total_in_bytes"] * 100
-            if disk_free < 15:
-                high_disk_nodes.append((n["name"], disk_free))
-
-        if high_disk_nodes:
-            for node, disk in high_disk_nodes:
-                self.results.append(Result(
-                    "Disk usage on node %s has exceeded the high watermark: %d%% free" % (node, disk),
-                    code="DISK_WATERMARK_EXCEEDED",
-                    bad=True,
-                    value=disk,
-                ))
-        else:
-            self.results.append(Result(
-                "Disk usage is within acceptable limits on all nodes",
-                code="DISK_WATERMARK_EXCEEDED",
-                bad=False,
-            ))
-        nodes_stats = self._load_json("nodes_stats.json")["nodes"].values()
-        high_cpu_nodes = []
-
-        for n in nodes_stats:
-            cpu_usage = n["os"]["cpu"]["percent"]
-            if cpu_usage > 80:
-                high_cpu_nodes.append((n["name"], cpu_usage))
-
-        if high_cpu_nodes:
-            for node, cpu in high_cpu_nodes:
-                self.results.append(Result(
-                    "High CPU usage on node %s: %d%%" % (node, cpu),
-                    code="HIGH_CPU_USAGE",
-                    bad=True,
-                    value=cpu,
-                ))
-        else:
-            self.results.append(Result(
-                "CPU usage is within acceptable limits on all nodes",
-                code="HIGH_CPU_USAGE",
-                bad=False,
-            ))
+        self._add_node_stats_results(
+            "DISK_WATERMARK_EXCEEDED",
+            "Disk usage on node {node} has exceeded the high watermark: {value}% free",
+            "Disk usage is within acceptable limits on all nodes",
+            format_value=int,
+        )
 
     def check_index_settings(self):
         settings_data = self._load_json("settings.json")
@@ -718,56 +845,56 @@ class Analyzer():
             # Check number of replicas
             number_of_replicas = int(index_settings.get("number_of_replicas", 1))
             if number_of_replicas < 1:
-                self.results.append(Result(
-                    "Index %s has less than 1 replica" % index,
+                self._add_result(Result(
+                    f"Index {index} has less than 1 replica",
                     code="LOW_NUMBER_OF_REPLICAS",
                     bad=True,
                     value=number_of_replicas,
                 ))
 
     def check(self):
-        self.check_cluster_health()
-        self.check_memory_usage()
-        self.check_unassigned_shards()
-        self.check_disk_watermark()
-        self.check_jvm_heap_usage()
-        self.check_pending_tasks()
-        self.check_cpu_usage()
-        self.check_disk_usage()
-        self.check_nodes()
-        self.check_settings()
-        self.check_indices()
-        self.check_shards()
-        self.check_fielddata()
-        self.check_field_count()
-        self.check_nested_fields()
-        self.check_hot_threads()
-        self.check_id_field_type()
-        self.check_custom_fields()
-        self.check_index_settings()
-        self.check_cpu_usage()
-        self.check_disk_usage()
+        if self._load_cached_results():
+            return self
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            self._prefetch_json(executor)
+            self.check_cluster_health()
+            self.check_memory_usage()
+            self.check_unassigned_shards()
+            self.check_disk_watermark()
+            self.check_jvm_heap_usage()
+            self.check_pending_tasks()
+            self.check_cpu_usage()
+            self.check_disk_usage()
+            self.check_nodes()
+            self.check_settings()
+            self.check_indices()
+            self.check_shards()
+            self.check_fielddata()
+            self.check_field_count()
+            self.check_nested_fields()
+            self.check_hot_threads()
+            self.check_id_field_type()
+            self.check_custom_fields()
+            self.check_index_settings()
+
+        self._save_cached_results()
         return self
 
     def render(self):
-        good = list(filter(lambda r: r.is_good(), self.results))
-        bad = list(filter(lambda r: r.is_bad(), self.results))
+        if self.bad:
+            self.console.print("BAD:", style=self.STYLE_BAD_HEADER)
+            self.console.print("\n".join(f" *  {rich.markup.escape(r.message)}" for r in self.bad), style=self.STYLE_BAD)
 
-        if any(bad):
-            self.console.print("BAD:", style="bold red")
-            for msg in bad:
-                self.console.print(" * ", msg.get_message(), style="bold red")
-
-        if any(self.charts):
-            self.console.print("CHARTS:", style="bold yellow")
+        if self.charts:
+            self.console.print("CHARTS:", style=self.STYLE_CHARTS_HEADER)
             for msg in self.charts:
-                self.console.print(msg, style="yellow")
+                self.console.print(msg, style=self.STYLE_CHARTS)
+
+        if self.good:
+            self.console.print("GOOD:", style=self.STYLE_GOOD_HEADER)
+            self.console.print("\n".join(f" *  {rich.markup.escape(r.message)}" for r in self.good), style=self.STYLE_GOOD)
 
-        if any(good):
-            self.console.print("GOOD:", style="bold green")
-            for msg in good:
-                self.console.print(" * ", msg.get_message(), style="green")    
-        
         return self
 
 if __name__ == "__main__":